@@ -74,6 +74,67 @@ from psyclone.psyir.nodes.omp_task_directive import (
 )
 from psyclone.psyir.symbols import INTEGER_TYPE, DataSymbol
 
+# Tuples of node types that are used in isinstance checks and walks.
+_ARRAY_REFERENCE_TYPES = (ArrayReference, ArrayOfStructuresReference)
+_ARRAY_MEMBER_TYPES = (ArrayOfStructuresMember, ArrayMember)
+_PARALLEL_OR_LOOP_TYPES = (OMPParallelDirective, Loop)
+
+
+class _ReferenceList:
+    '''
+    An ordered collection of References which also indexes its entries by
+    their type and symbol name. Two References can only be equal if both of
+    these match, so membership tests only need to compare against the
+    entries in the matching bucket instead of against every entry.
+
+    Only appending, iterating, membership tests and len() are supported,
+    so that the index can not get out of step with the entries.
+
+    '''
+    def __init__(self):
+        self._refs = []
+        self._buckets = {}
+
+    @staticmethod
+    def _key(ref):
+        '''
+        :param ref: the Reference to compute the key for.
+        :type ref: :py:class:`psyclone.psyir.nodes.Reference`
+
+        :returns: the key of the bucket that ref belongs to.
+        :rtype: Tuple[type, str]
+
+        '''
+        return (type(ref), ref.symbol.name)
+
+    def append(self, ref):
+        '''
+        Appends the supplied Reference to this list.
+
+        :param ref: the Reference to add to the list.
+        :type ref: :py:class:`psyclone.psyir.nodes.Reference`
+
+        '''
+        self._refs.append(ref)
+        self._buckets.setdefault(self._key(ref), []).append(ref)
+
+    def __contains__(self, ref):
+        '''
+        :param ref: the Reference to search for.
+        :type ref: :py:class:`psyclone.psyir.nodes.Reference`
+
+        :returns: whether an entry equal to ref is in this list.
+        :rtype: bool
+
+        '''
+        return ref in self._buckets.get(self._key(ref), ())
+
+    def __iter__(self):
+        return iter(self._refs)
+
+    def __len__(self):
+        return len(self._refs)
+
 
 class DynamicOMPTaskDirective(OMPTaskDirective):
     """
@@ -169,6 +230,7 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
         self._parent_parallel = None
         self._parallel_private = None
         self._parallel_firstprivate = None
+        self._parallel_private_names = frozenset()
 
         # We need to do extra steps when inside a Kern to correctly identify
         # symbols.
@@ -263,14 +325,14 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
         :raises GenerationError: if no ancestor OMPParallelDirective is
                                  found.
         """
-        anc = self.ancestor((OMPParallelDirective, Loop))
+        anc = self.ancestor(_PARALLEL_OR_LOOP_TYPES)
         while isinstance(anc, Loop):
             # Store the loop variable of each parent loop
             var = anc.variable
             self._parent_loop_vars.append(var)
             self._parent_loops.append(anc)
             # Recurse up the tree
-            anc = anc.ancestor((OMPParallelDirective, Loop))
+            anc = anc.ancestor(_PARALLEL_OR_LOOP_TYPES)
 
         if not isinstance(anc, OMPParallelDirective):
             raise GenerationError("Failed to find an ancestor "
@@ -280,10 +342,15 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
 
         # Store the parent parallel directive node
         self._parent_parallel = anc
-        self._parallel_private, self._parallel_firstprivate, _ = \
-            anc.infer_sharing_attributes()
-        self._parallel_private = self._parallel_private.union(
-                self._parallel_firstprivate)
+        # These are only used for membership tests, so store them as
+        # immutable sets.
+        private, firstprivate, _ = anc.infer_sharing_attributes()
+        self._parallel_firstprivate = frozenset(firstprivate)
+        self._parallel_private = self._parallel_firstprivate.union(private)
+        # Also store the names of the private symbols so that membership
+        # checks by name don't need to loop over all of them.
+        self._parallel_private_names = frozenset(
+                sym.name for sym in self._parallel_private)
 
     def _handle_proxy_loop_index(self, index_list, dim, index,
                                  clause_lists):
@@ -357,10 +424,7 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
         :returns: True if ref is private, else False.
         :rtype: bool
         """
-        for parent_sym in self._parallel_private:
-            if ref.symbol.name == parent_sym.name:
-                return True
-        return False
+        return ref.symbol.name in self._parallel_private_names
 
     def _evaluate_readonly_baseref(
         self, ref, clause_lists
@@ -513,6 +577,36 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
 
         return binop, binop2
 
+    def _add_index_binops(self, node, ref, step_val, literal_val,
+                          ref_index, index_list):
+        """
+        Computes the BinaryOperation(s) required to express the dependencies
+        of an array index of the form Reference +/- Literal (or Literal +/-
+        Reference) on a loop variable with the given step, and adds them to
+        index_list.
+
+        :param node: the BinaryOperation being evaluated.
+        :type node: :py:class:`psyclone.psyir.nodes.BinaryOperation`
+        :param ref: the Reference representing the loop variable inside node.
+        :type ref: :py:class:`psyclone.psyir.nodes.Reference`
+        :param int step_val: the step of the loop for the loop variable.
+        :param int literal_val: the value of the Literal child of node.
+        :param int ref_index: the index of the Reference child of node.
+        :param index_list: the list of indices to add the result to.
+        :type index_list: List[:py:class:`psyclone.psyir.nodes.Node`]
+
+        """
+        divisor = math.ceil(literal_val / step_val)
+        modulo = literal_val % step_val
+        binop, binop2 = self._create_binops_from_step_and_divisors(
+                node, ref, step_val, divisor, modulo, ref_index
+        )
+        # Add this to the list of indexes
+        if binop2 is not None:
+            index_list.append([binop, binop2])
+        else:
+            index_list.append(binop)
+
     def _handle_index_binop(
         self, node, index_list, clause_lists
     ):
@@ -643,28 +737,18 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
         # Handle the proxy_loop case
         if is_proxy:
             # Treat it as though we came across the parent loop variable.
-            parent_loop = self._proxy_loop_vars[index_symbol].parent_loop
-
-            # Create a Reference to the real variable
-            real_ref = self._proxy_loop_vars[index_symbol].parent_node.copy()
-            for temp_ref in self._proxy_loop_vars[index_symbol].parent_node:
+            proxy_var = self._proxy_loop_vars[index_symbol]
+            # We have a Literal step value, and a Literal in
+            # the Binary Operation. These Literals must both be
+            # Integer types, so we will convert them to integers.
+            # These don't depend on the real variable so only do it once.
+            step_val = int(proxy_var.parent_loop.step_expr.value)
+            literal_val = int(literal.value)
+            for temp_ref in proxy_var.parent_node:
+                # Create a Reference to the real variable
                 real_ref = temp_ref.copy()
-                # We have a Literal step value, and a Literal in
-                # the Binary Operation. These Literals must both be
-                # Integer types, so we will convert them to integers
-                # and do some divison.
-                step_val = int(parent_loop.step_expr.value)
-                literal_val = int(literal.value)
-                divisor = math.ceil(literal_val / step_val)
-                modulo = literal_val % step_val
-                binop, binop2 = self._create_binops_from_step_and_divisors(
-                        node, real_ref, step_val, divisor, modulo, ref_index
-                )
-                # Add this to the list of indexes
-                if binop2 is not None:
-                    index_list.append([binop, binop2])
-                else:
-                    index_list.append(binop)
+                self._add_index_binops(node, real_ref, step_val, literal_val,
+                                       ref_index, index_list)
         # Proxy loop cases handled - end of "if is_proxy" statement.
 
         # If the variable is private:
@@ -706,21 +790,11 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
                     parent_loop = self._parent_loops[ind]
                     # We have a Literal step value, and a Literal in
                     # the Binary Operation. These Literals must both be
-                    # Integer types, so we will convert them to integers
-                    # and do some divison.
+                    # Integer types, so we will convert them to integers.
                     step_val = int(parent_loop.step_expr.value)
                     literal_val = int(literal.value)
-                    divisor = math.ceil(literal_val / step_val)
-                    modulo = literal_val % step_val
-                    binop, binop2 = self._create_binops_from_step_and_divisors(
-                            node, ref, step_val, divisor,
-                            modulo, ref_index
-                    )
-                    # Add this to the list of indexes
-                    if binop2 is not None:
-                        index_list.append([binop, binop2])
-                    else:
-                        index_list.append(binop)
+                    self._add_index_binops(node, ref, step_val, literal_val,
+                                           ref_index, index_list)
                 else:
                     # It can't be a child loop variable (these have to be
                     # private). Just has to be a firstprivate constant, which
@@ -735,16 +809,12 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
                 f"supported. The full access is '{node.debug_string()}'."
             )
 
-    def _evaluate_readonly_arrayref(
-        self, ref, clause_lists
-    ):
+    def _evaluate_readonly_indices(self, indices, array, full_access,
+                                   clause_lists, index_list):
         """
-        Evaluates a read-only access to an Array inside the task region, and
-        computes any data-sharing clauses and dependency clauses based upon the
-        access.
-
-        This is done by evaluating each of the array indices, and determining
-        whether they are:
+        Evaluates the indices of a read-only array access inside the task
+        region and adds the indices required for its dependencies to
+        index_list. Each index must be:
         1. A Literal index, in which case we need a dependency to that
            specific section of the array.
         2. A Reference index, in which case we need a dependency to the section
@@ -752,12 +822,12 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
         3. A Binary Operation, in which case the code calls
           `_handle_index_binop` to evaluate any additional dependencies.
 
-        Once these have been computed, any new dependencies are added into the
-        in_list, and the array reference itself will be added to the
-        shared_list if not already present.
-
-        :param node: The Reference to be evaluated.
-        :type node: :py:class:`psyclone.psyir.nodes.Reference`
+        :param indices: the indices of the array access.
+        :type indices: List[:py:class:`psyclone.psyir.nodes.Node`]
+        :param array: the array access to use to create full ranges.
+        :type array: :py:class:`psyclone.psyir.nodes.array_mixin.ArrayMixin`
+        :param full_access: the full access, used in error messages.
+        :type full_access: :py:class:`psyclone.psyir.nodes.Reference`
         :param clause_lists: The namedtuple containing the lists storing the
                              clauses.
         :type clause_lists: namedtuple(
@@ -776,29 +846,14 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
                             out_list=List[
                                 :py:class:`psyclone.psyir.nodes.Reference`
                             ])
+        :param index_list: the list to add the computed indices to.
+        :type index_list: List[:py:class:`psyclone.psyir.nodes.Node`]
 
         :raises GenerationError: If an array index is a shared variable.
         :raises GenerationError: If an array index is not a Reference, Literal
                                  or BinaryOperation.
         """
-        # Index list stores the set of indices to use with this ArrayMixin
-        # for the depend clause.
-        index_list = []
-
-        # Arrays are always shared variables in the parent parallel region.
-
-        # The reference is shared. Since it is an array,
-        # we need to check the following restrictions:
-        # 1. No ArrayReference or ArrayOfStructuresReference
-        # or StructureReference appear in the indexing.
-        # 2. Each index is a firstprivate variable, or a
-        # private parent variable that has not yet been
-        # declared (in which case we declare it as
-        # firstprivate). Alternatively each index is
-        # a BinaryOperation whose children are a
-        # Reference to a firstprivate variable and a
-        # Literal, with operator of ADD or SUB
-        for dim, index in enumerate(ref.indices):
+        for dim, index in enumerate(indices):
             # pylint: disable=unidiomatic-typecheck
             if type(index) is Reference:
                 # Check whether the Reference is private
@@ -818,7 +873,7 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
                     # of the loop is used.
                     if index.symbol in child_loop_vars:
                         # Append a full Range (i.e., :)
-                        full_range = ref.get_full_range(dim)
+                        full_range = array.get_full_range(dim)
                         index_list.append(full_range)
                     elif index.symbol in self._proxy_loop_vars:
                         # Special case 2. the index is a proxy for a parent
@@ -839,7 +894,7 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
                         f"as an array index inside an "
                         f"OMPTaskDirective which is not "
                         f"supported. Variable name is '{index.symbol.name}'. "
-                        f"The full access is '{ref.debug_string()}'."
+                        f"The full access is '{full_access.debug_string()}'."
                     )
             elif isinstance(index, BinaryOperation):
                 # Binary Operation check
@@ -861,6 +916,72 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
                     f"'{index.debug_string()}'."
                 )
 
+    def _evaluate_readonly_arrayref(
+        self, ref, clause_lists
+    ):
+        """
+        Evaluates a read-only access to an Array inside the task region, and
+        computes any data-sharing clauses and dependency clauses based upon the
+        access.
+
+        This is done by evaluating each of the array indices, and determining
+        whether they are:
+        1. A Literal index, in which case we need a dependency to that
+           specific section of the array.
+        2. A Reference index, in which case we need a dependency to the section
+           of the array represented by that Reference.
+        3. A Binary Operation, in which case the code calls
+          `_handle_index_binop` to evaluate any additional dependencies.
+
+        Once these have been computed, any new dependencies are added into the
+        in_list, and the array reference itself will be added to the
+        shared_list if not already present.
+
+        :param node: The Reference to be evaluated.
+        :type node: :py:class:`psyclone.psyir.nodes.Reference`
+        :param clause_lists: The namedtuple containing the lists storing the
+                             clauses.
+        :type clause_lists: namedtuple(
+                            private_list=List[
+                                :py:class:`psyclone.psyir.nodes.Reference`
+                            ],
+                            firstprivate_list=List[
+                                :py:class:`psyclone.psyir.nodes.Reference`
+                            ],
+                            shared_list=List[
+                                :py:class:`psyclone.psyir.nodes.Reference`
+                            ],
+                            in_list=List[
+                                :py:class:`psyclone.psyir.nodes.Reference`
+                            ],
+                            out_list=List[
+                                :py:class:`psyclone.psyir.nodes.Reference`
+                            ])
+
+        :raises GenerationError: If an array index is a shared variable.
+        :raises GenerationError: If an array index is not a Reference, Literal
+                                 or BinaryOperation.
+        """
+        # Index list stores the set of indices to use with this ArrayMixin
+        # for the depend clause.
+        index_list = []
+
+        # Arrays are always shared variables in the parent parallel region.
+
+        # The reference is shared. Since it is an array,
+        # we need to check the following restrictions:
+        # 1. No ArrayReference or ArrayOfStructuresReference
+        # or StructureReference appear in the indexing.
+        # 2. Each index is a firstprivate variable, or a
+        # private parent variable that has not yet been
+        # declared (in which case we declare it as
+        # firstprivate). Alternatively each index is
+        # a BinaryOperation whose children are a
+        # Reference to a firstprivate variable and a
+        # Literal, with operator of ADD or SUB
+        self._evaluate_readonly_indices(ref.indices, ref, ref, clause_lists,
+                                        index_list)
+
         # Add all combinations of dependencies from the computed index_list
         # into in_list
         self._add_dependencies_from_index_list(index_list,
@@ -983,12 +1104,11 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
                                  an ArrayMember of ArrayOfStructuresMember as
                                  a child is found.
         """
-        if isinstance(ref, (ArrayReference, ArrayOfStructuresReference)):
+        if isinstance(ref, _ARRAY_REFERENCE_TYPES):
             # If ref is an ArrayOfStructuresReference and contains an
             # ArrayMember then we can't handle this case.
             if isinstance(ref, ArrayOfStructuresReference):
-                array_children = ref.walk((ArrayOfStructuresMember,
-                                           ArrayMember))
+                array_children = ref.walk(_ARRAY_MEMBER_TYPES)
                 if array_children:
                     raise GenerationError(
                         f"PSyclone doesn't support an OMPTaskDirective "
@@ -1006,7 +1126,7 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
             # we need to treat it differently, like an arrayref, however
             # the code to handle an arrayref is not compatible with more
             # than one ArrayMixin child.
-            array_children = ref.walk((ArrayOfStructuresMember, ArrayMember))
+            array_children = ref.walk(_ARRAY_MEMBER_TYPES)
             if array_children:
                 if len(array_children) > 1:
                     raise GenerationError(
@@ -1089,68 +1209,13 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
         :raises GenerationError: If an array index is not a Reference, Literal
                                  or BinaryOperation.
         """
-        for dim, index in enumerate(array_access_member.indices):
-            # pylint: disable=unidiomatic-typecheck
-            if type(index) is Reference:
-                # Check whether the Reference is private
-                index_private = self._is_reference_private(index)
-                # Check whether the reference is to a child loop variable.
-                child_loop_vars = self._child_loop_vars
-
-                if index_private:
-                    if (
-                        index not in clause_lists.private_list
-                        and index not in clause_lists.firstprivate_list
-                    ):
-                        clause_lists.firstprivate_list.append(index.copy())
-                    # Special case 1. If index belongs to a child loop
-                    # that is NOT a proxy for a parent loop, then we
-                    # can only do as well as guessing the entire range
-                    # of the loop is used.
-                    if index.symbol in child_loop_vars:
-                        # Append a full Range (i.e., :)
-                        full_range = sref_base.walk(ArrayMember)[0].\
-                                get_full_range(dim)
-                        index_list.append(full_range)
-                    elif index.symbol in self._proxy_loop_vars:
-                        # Special case 2. the index is a proxy for a parent
-                        # loop's variable. In this case, we add a reference to
-                        # the parent loop's value. We create a list of all
-                        # possible variants, as we might have multiple values
-                        # set for a value, e.g. for a boundary condition if
-                        # statement.
-                        self._handle_proxy_loop_index(index_list, dim, index,
-                                                      clause_lists)
-                    else:
-                        # Final case is just a generic Reference, in which case
-                        # just copy the Reference
-                        index_list.append(index.copy())
-                else:
-                    raise GenerationError(
-                        f"Shared variable access used "
-                        f"as an array index inside an "
-                        f"OMPTaskDirective which is not "
-                        f"supported. Variable name is '{index.symbol.name}'. "
-                        f"The full access is '{sref_base.debug_string()}'."
-                    )
-            elif isinstance(index, BinaryOperation):
-                # Binary Operation check
-                # A single binary operation, e.g. a(i+1) can require
-                # multiple clauses to correctly handle.
-                self._handle_index_binop(
-                    index, index_list, clause_lists
-                )
-            elif isinstance(index, Literal):
-                # Just place literal directly into the dependency clause.
-                index_list.append(index.copy())
-            else:
-                # Not allowed type appears
-                raise GenerationError(
-                    f"'{type(index).__name__}' object is not allowed to "
-                    f"appear in an array index "
-                    f"expression inside an "
-                    f"OMPTaskDirective."
-                )
+        # sref_base is a copy of the structure that contains
+        # array_access_member, so the member can be used directly to create
+        # any full ranges.
+        self._evaluate_readonly_indices(
+                array_access_member.indices, array_access_member,
+                sref_base, clause_lists, index_list
+        )
 
     def _evaluate_structure_with_array_reference_write(
         self,
@@ -1307,9 +1372,7 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
                     # of the loop is used.
                     if index.symbol in child_loop_vars:
                         # Return a Full Range (i.e. :)
-                        full_range = ref.walk(ArrayMixin)[0].get_full_range(
-                                dim
-                        )
+                        full_range = ref.get_full_range(dim)
                         index_list.append(full_range)
                     elif index.symbol in self._proxy_loop_vars:
                         # Special case 2. the index is a proxy for a parent
@@ -1330,8 +1393,7 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
                             # the value of this is at the time we evaluate the
                             # depend clause, so we can only generate a full
                             # range (:)
-                            full_range = ref.walk(ArrayMixin)[0].\
-                                    get_full_range(dim)
+                            full_range = ref.get_full_range(dim)
                             index_list.append(full_range)
                 else:
                     raise GenerationError(
@@ -1436,12 +1498,11 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
                                  an ArrayMember of ArrayOfStructuresMember as
                                  a child if found.
         """
-        if isinstance(ref, (ArrayReference, ArrayOfStructuresReference)):
+        if isinstance(ref, _ARRAY_REFERENCE_TYPES):
             # If ref is an ArrayOfStructuresReference and contains an
             # ArrayMember then we can't handle this case.
             if isinstance(ref, ArrayOfStructuresReference):
-                array_children = ref.walk((ArrayOfStructuresMember,
-                                           ArrayMember))
+                array_children = ref.walk(_ARRAY_MEMBER_TYPES)
                 if array_children:
                     raise GenerationError(
                         f"PSyclone doesn't support an OMPTaskDirective "
@@ -1459,7 +1520,7 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
             # we need to treat it differently, like an arrayref, however
             # the code to handle an arrayref is not compatible with more
             # than one ArrayMixin child
-            array_children = ref.walk((ArrayOfStructuresMember, ArrayMember))
+            array_children = ref.walk(_ARRAY_MEMBER_TYPES)
             if array_children:
                 if len(array_children) > 1:
                     raise GenerationError(
@@ -1614,15 +1675,96 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
         for intrinsic in node.walk(IntrinsicCall):
             self._evaluate_intrinsic(intrinsic, clause_lists)
 
-        for ref in references:
-            # If the ref has an IntrinsicCall ancestor, it will already
-            # have been evaluated
-            if ref.ancestor(IntrinsicCall):
-                continue
+        # References inside an IntrinsicCall will already have been
+        # evaluated, so don't descend into them. This avoids searching up
+        # the tree for an IntrinsicCall ancestor of every reference.
+        for ref in rhs.walk(Reference, stop_type=IntrinsicCall):
             self._evaluate_readonly_reference(
                 ref, clause_lists
             )
 
+    def _evaluate_loop_bound_refs(self, refs, expr, bound_name,
+                                  clause_lists):
+        """
+        Evaluates the References in the start, stop or step expression of a
+        Loop inside this task region. Non-array References are declared as
+        firstprivate unless they are already private, firstprivate or shared.
+        For StructureReferences only the base symbol is used, and it is
+        declared as shared and as an input dependency.
+
+        :param refs: the References in the loop bound expression.
+        :type refs: List[:py:class:`psyclone.psyir.nodes.Reference`]
+        :param expr: the loop bound expression.
+        :type expr: :py:class:`psyclone.psyir.nodes.DataNode`
+        :param str bound_name: which loop bound this is ("start", "stop" or
+                               "step").
+        :param clause_lists: The namedtuple containing the lists storing the
+                             clauses.
+        :type clause_lists: namedtuple(
+                            private_list=List[
+                                :py:class:`psyclone.psyir.nodes.Reference`
+                            ],
+                            firstprivate_list=List[
+                                :py:class:`psyclone.psyir.nodes.Reference`
+                            ],
+                            shared_list=List[
+                                :py:class:`psyclone.psyir.nodes.Reference`
+                            ],
+                            in_list=List[
+                                :py:class:`psyclone.psyir.nodes.Reference`
+                            ],
+                            out_list=List[
+                                :py:class:`psyclone.psyir.nodes.Reference`
+                            ])
+
+        :raises GenerationError: If the expression contains an
+                                 ArrayReference or ArrayOfStructuresReference.
+        :raises GenerationError: If the step expression contains an
+                                 IntrinsicCall.
+        """
+        for ref in refs:
+            if isinstance(ref, _ARRAY_REFERENCE_TYPES):
+                raise GenerationError(
+                    f"'{type(ref).__name__}' not supported in "
+                    f"the {bound_name} variable of a Loop in a "
+                    f"OMPTaskDirective node. The {bound_name} expression is "
+                    f"'{expr.debug_string()}'."
+                )
+            # The references can only be inside an IntrinsicCall that is
+            # part of the expression, so there's no need to search beyond it.
+            icall = ref.ancestor(IntrinsicCall, limit=expr)
+            if icall:
+                # We disallow intrinsic calls inside the step value, this is
+                # beyond the scope of the current implementation
+                if bound_name == "step":
+                    raise GenerationError(
+                        f"IntrinsicCall not supported in the step variable "
+                        f"of a Loop in an OMPTaskDirective node. The step "
+                        f"expression is '{expr.debug_string()}'."
+                    )
+                # Ignore references inside inquiry IntrinsicCalls (e.g. BOUNDs)
+                if icall.intrinsic.is_inquiry:
+                    continue
+            # If we have a StructureReference, then we need to only add the
+            # base symbol to the lists
+            if isinstance(ref, StructureReference):
+                ref_copy = Reference(ref.symbol)
+                # Loop bounds can't be written to in Fortran so if its a
+                # structure we should make it shared
+                # Only the base Structure is allowed to be in a depend clause
+                # in OpenMP, see OpenMP section 2.1
+                if ref_copy not in clause_lists.shared_list:
+                    clause_lists.shared_list.append(ref_copy.copy())
+                if ref_copy not in clause_lists.in_list:
+                    clause_lists.in_list.append(ref_copy.copy())
+                ref = ref_copy
+            if (
+                ref not in clause_lists.firstprivate_list
+                and ref not in clause_lists.private_list
+                and ref not in clause_lists.shared_list
+            ):
+                clause_lists.firstprivate_list.append(ref.copy())
+
     def _evaluate_loop(
         self,
         node,
@@ -1727,105 +1869,12 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
 
         # For all non-array accesses we make them firstprivate unless they
         # are already declared as something else
-        for ref in start_val_refs:
-            if isinstance(ref, (ArrayReference, ArrayOfStructuresReference)):
-                raise GenerationError(
-                    f"'{type(ref).__name__}' not supported in "
-                    f"the start variable of a Loop in a "
-                    f"OMPTaskDirective node. The start expression is "
-                    f"'{node.start_expr.debug_string()}'."
-                )
-            # Ignore references inside inquiry IntrinsicCalls (e.g. BOUNDs)
-            icall = ref.ancestor(IntrinsicCall)
-            if icall and icall.intrinsic.is_inquiry:
-                continue
-            # If we have a StructureReference, then we need to only add the
-            # base symbol to the lists
-            if isinstance(ref, StructureReference):
-                ref_copy = Reference(ref.symbol)
-                # start_val can't be written to in Fortran so if its a
-                # structure we should make it shared
-                # Only the base Structure is allowed to be in a depend clause
-                # in OpenMP, see OpenMP section 2.1
-                if ref_copy not in clause_lists.shared_list:
-                    clause_lists.shared_list.append(ref_copy.copy())
-                if ref_copy not in clause_lists.in_list:
-                    clause_lists.in_list.append(ref_copy.copy())
-                ref = ref_copy
-            if (
-                ref not in clause_lists.firstprivate_list
-                and ref not in clause_lists.private_list
-                and ref not in clause_lists.shared_list
-            ):
-                clause_lists.firstprivate_list.append(ref.copy())
-
-        stop_val_refs = stop_val.walk(Reference)
-        for ref in stop_val_refs:
-            if isinstance(ref, (ArrayReference, ArrayOfStructuresReference)):
-                raise GenerationError(
-                    f"'{type(ref).__name__}' not supported in "
-                    f"the stop variable of a Loop in a "
-                    f"OMPTaskDirective node. The stop expression is "
-                    f"'{node.stop_expr.debug_string()}'."
-                )
-            # Ignore references inside inquiry IntrinsicCalls (e.g. BOUNDs)
-            icall = ref.ancestor(IntrinsicCall)
-            if icall and icall.intrinsic.is_inquiry:
-                continue
-            # If we have a StructureReference, then we need to only add the
-            # base symbol to the lists
-            if isinstance(ref, StructureReference):
-                ref_copy = Reference(ref.symbol)
-                # stop_val can't be written to in Fortran so if its a structure
-                # we should make it shared
-                # Only the base Structure is allowed to be in a depend clause.
-                if ref_copy not in clause_lists.shared_list:
-                    clause_lists.shared_list.append(ref_copy.copy())
-                if ref_copy not in clause_lists.in_list:
-                    clause_lists.in_list.append(ref_copy.copy())
-                ref = ref_copy
-            if (
-                ref not in clause_lists.firstprivate_list
-                and ref not in clause_lists.private_list
-                and ref not in clause_lists.shared_list
-            ):
-                clause_lists.firstprivate_list.append(ref.copy())
-
-        step_val_refs = step_val.walk(Reference)
-        for ref in step_val_refs:
-            if isinstance(ref, (ArrayReference, ArrayOfStructuresReference)):
-                raise GenerationError(
-                    f"'{type(ref).__name__}' not supported in "
-                    f"the step variable of a Loop in a "
-                    f"OMPTaskDirective node. The step expression is "
-                    f"'{node.step_expr.debug_string()}'."
-                )
-            # We disallow intrinsic calls inside the step value, this is
-            # beyond the scope of the current implementation
-            if ref.ancestor(IntrinsicCall):
-                raise GenerationError(
-                    f"IntrinsicCall not supported in the step variable "
-                    f"of a Loop in an OMPTaskDirective node. The step "
-                    f"expression is '{node.step_expr.debug_string()}'."
-                )
-            # If we have a StructureReference, then we need to only add the
-            # base symbol to the lists
-            if isinstance(ref, StructureReference):
-                ref_copy = Reference(ref.symbol)
-                # stop_val can't be written to in Fortran so if its a structure
-                # we should make it shared
-                # Only the base Structure is allowed to be in a depend clause.
-                if ref_copy not in clause_lists.shared_list:
-                    clause_lists.shared_list.append(ref_copy.copy())
-                if ref_copy not in clause_lists.in_list:
-                    clause_lists.in_list.append(ref_copy.copy())
-                ref = ref_copy
-            if (
-                ref not in clause_lists.firstprivate_list
-                and ref not in clause_lists.private_list
-                and ref not in clause_lists.shared_list
-            ):
-                clause_lists.firstprivate_list.append(ref.copy())
+        self._evaluate_loop_bound_refs(start_val_refs, start_val, "start",
+                                       clause_lists)
+        self._evaluate_loop_bound_refs(stop_val.walk(Reference), stop_val,
+                                       "stop", clause_lists)
+        self._evaluate_loop_bound_refs(step_val.walk(Reference), step_val,
+                                       "step", clause_lists)
 
         # Finished handling the loop bounds now
 
@@ -2022,11 +2071,13 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
 
         # These lists will store PSyclone nodes which are to be added to the
         # clauses for this OMPTaskDirective.
-        private_list = []
-        firstprivate_list = []
-        shared_list = []
-        in_list = []
-        out_list = []
+        # These lists are only ever appended to but are checked for
+        # membership very often, so use a list that indexes its entries.
+        private_list = _ReferenceList()
+        firstprivate_list = _ReferenceList()
+        shared_list = _ReferenceList()
+        in_list = _ReferenceList()
+        out_list = _ReferenceList()
         clause_lists = self._clause_lists(private_list, firstprivate_list,
                                           shared_list, in_list, out_list)
 
@@ -1082,21 +1082,36 @@ class Node():
 
         '''
         local_list = []
-        if isinstance(self, my_type) and depth in [None, self.depth]:
-            local_list.append(self)
-
-        # Stop recursion further into the tree if an instance of a class
-        # listed in stop_type is found.
-        if stop_type and isinstance(self, stop_type):
-            return local_list
-
-        # Stop recursion further into the tree if a depth level has been
-        # specified and it is reached.
-        if depth is not None and self.depth >= depth:
+        if depth is None:
+            # Pre-order traversal using an explicit stack (children are
+            # pushed in reverse so that they are visited in order).
+            to_visit = [self]
+            while to_visit:
+                node = to_visit.pop()
+                if isinstance(node, my_type):
+                    local_list.append(node)
+                # Stop recursion further into the tree if an instance of a
+                # class listed in stop_type is found.
+                if stop_type and isinstance(node, stop_type):
+                    continue
+                to_visit.extend(reversed(node.children))
             return local_list
 
-        for child in self.children:
-            local_list += child.walk(my_type, stop_type, depth=depth)
+        # A depth has been specified. Compute the depth of this node only
+        # once and keep track of the depth of each node as we descend.
+        to_visit = [(self, self.depth)]
+        while to_visit:
+            node, node_depth = to_visit.pop()
+            if isinstance(node, my_type) and node_depth == depth:
+                local_list.append(node)
+            if stop_type and isinstance(node, stop_type):
+                continue
+            # Stop recursion further into the tree if the specified depth
+            # level is reached.
+            if node_depth >= depth:
+                continue
+            to_visit.extend((child, node_depth + 1)
+                            for child in reversed(node.children))
         return local_list
 
     def get_sibling_lists(self, my_type, stop_type=None):
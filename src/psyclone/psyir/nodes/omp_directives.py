@@ -80,6 +80,15 @@ from psyclone.psyir.symbols import INTEGER_TYPE, ScalarType, DataSymbol
 # reduction clause of an OpenMP directive.
 OMP_OPERATOR_MAPPING = {AccessType.SUM: "+"}
 
+# The types of node that can modify the value of a symbol.
+_MODIFYING_NODE_TYPES = (Assignment, Loop, Call)
+
+# The valid reduction modes, each paired with its OpenMP reduction operator.
+# These do not change so they are only looked up once.
+_OMP_REDUCTION_MODES = tuple(
+    (mode, OMP_OPERATOR_MAPPING[mode])
+    for mode in AccessType.get_valid_reduction_modes())
+
 
 class OMPDirective(metaclass=abc.ABCMeta):
     '''
@@ -95,6 +104,25 @@ class OMPDirective(metaclass=abc.ABCMeta):
     '''
     _PREFIX = "OMP"
 
+    def _nearest_omp_parallel(self):
+        '''
+        Equivalent to (but cheaper than) calling `self.ancestor(
+        OMPParallelDirective, excluding=OMPParallelDoDirective)`, which is
+        needed by the validation of several directives.
+
+        :returns: the closest ancestor OMPParallelDirective that is not an
+            OMPParallelDoDirective or None if there is no such ancestor.
+        :rtype: Optional[:py:class:`psyclone.psyir.nodes.OMPParallelDirective`]
+
+        '''
+        node = self.parent
+        while node is not None:
+            if (isinstance(node, OMPParallelDirective) and
+                    not isinstance(node, OMPParallelDoDirective)):
+                return node
+            node = node.parent
+        return None
+
 
 class OMPRegionDirective(OMPDirective, RegionDirective, metaclass=abc.ABCMeta):
     '''
@@ -117,20 +145,21 @@ class OMPRegionDirective(OMPDirective, RegionDirective, metaclass=abc.ABCMeta):
         :rtype: list[str]
 
         '''
-        result = []
-
         # TODO #514: not yet working with generic PSyIR, so skip for now
         if Config.get().api not in ('gocean', 'lfric'):
-            return result
+            return []
 
+        # Use a dict (rather than a list) to keep the names unique while
+        # preserving the order in which they are first encountered.
+        result = {}
         const = Config.get().api_conf().get_constants()
+        scalar_names = const.VALID_SCALAR_NAMES
         for call in self.kernels():
             for arg in call.arguments.args:
-                if arg.argument_type in const.VALID_SCALAR_NAMES:
-                    if arg.descriptor.access == reduction_type:
-                        if arg.name not in result:
-                            result.append(arg.name)
-        return result
+                if (arg.argument_type in scalar_names and
+                        arg.descriptor.access == reduction_type):
+                    result[arg.name] = None
+        return list(result)
 
 
 class OMPStandaloneDirective(OMPDirective, StandaloneDirective,
@@ -206,8 +235,7 @@ class OMPTaskwaitDirective(OMPStandaloneDirective):
         # can apply transformations to the code). As a Parallel Child
         # directive, we must have an OMPParallelDirective as an ancestor
         # somewhere back up the tree.
-        if not self.ancestor(OMPParallelDirective,
-                             excluding=OMPParallelDoDirective):
+        if not self._nearest_omp_parallel():
             raise GenerationError(
                 "OMPTaskwaitDirective must be inside an OMP parallel region "
                 "but could not find an ancestor OMPParallelDirective node")
@@ -334,7 +362,7 @@ class OMPSerialDirective(OMPRegionDirective, metaclass=abc.ABCMeta):
         for node in preceding_nodes:
             # Only Assignment, Loop or Call nodes can modify the symbol in our
             # Reference
-            if not isinstance(node, (Assignment, Loop, Call)):
+            if not isinstance(node, _MODIFYING_NODE_TYPES):
                 continue
             # At the moment we allow all IntrinsicCall nodes through, and
             # assume that all IntrinsicCall nodes we find don't modify
@@ -1098,8 +1126,7 @@ class OMPSerialDirective(OMPRegionDirective, metaclass=abc.ABCMeta):
         # It could in principle be allowed for that parent to be a ParallelDo
         # directive, however I can't think of a use case that would be done
         # best in a parallel code by that pattern
-        if not self.ancestor(OMPParallelDirective,
-                             excluding=OMPParallelDoDirective):
+        if not self._nearest_omp_parallel():
             raise GenerationError(
                 f"{self._text_name} must be inside an OMP parallel region but "
                 f"could not find an ancestor OMPParallelDirective node")
@@ -1186,7 +1213,7 @@ class OMPSingleDirective(OMPSerialDirective):
                                 nowait_string))
 
         # Generate the code for all of this node's children
-        for child in self.dir_body:
+        for child in self.dir_body.children:
             child.gen_code(parent)
 
         # Generate the end code for this node
@@ -1355,39 +1382,37 @@ class OMPParallelDirective(OMPRegionDirective):
         from psyclone.psyGen import zero_reduction_variables
 
         # We're not doing nested parallelism so make sure that this
-        # omp parallel region is not already within some parallel region
+        # omp parallel region is not already within some parallel region.
+        # This also checks that the region encloses other OpenMP directives.
         self.validate_global_constraints()
 
-        # Check that this OpenMP PARALLEL directive encloses other
-        # OpenMP directives. Although it is valid OpenMP if it doesn't,
-        # this almost certainly indicates a user error.
-        self._encloses_omp_directive()
-
-        # Generate the private and firstprivate clauses
+        # Generate the private and firstprivate clauses. Only the sorted
+        # names are needed here, so there is no need to create the clause
+        # nodes themselves.
         private, fprivate, need_sync = self.infer_sharing_attributes()
-        private_clause = OMPPrivateClause.create(
-                            sorted(private, key=lambda x: x.name))
-        fprivate_clause = OMPFirstprivateClause.create(
-                            sorted(fprivate, key=lambda x: x.name))
+        private_list = sorted(symbol.name for symbol in private)
+        fp_list = sorted(symbol.name for symbol in fprivate)
         if need_sync:
             raise GenerationError(
                 f"OMPParallelDirective.gen_code() does not support symbols "
                 f"that need synchronisation, but found: "
                 f"{[x.name for x in need_sync]}")
 
-        reprod_red_call_list = self.reductions(reprod=True)
+        # Walk the tree for kernels with reductions just once and derive the
+        # reproducible ones from that list.
+        calls = self.reductions()
+        reprod_red_call_list = [call for call in calls
+                                if call.reprod_reduction]
         if reprod_red_call_list:
             # we will use a private thread index variable
             thread_idx = self.scope.symbol_table.\
                 lookup_with_tag("omp_thread_index")
-            private_clause.addchild(Reference(thread_idx))
             thread_idx = thread_idx.name
+            private_list.append(thread_idx)
             # declare the variable
             parent.add(DeclGen(parent, datatype="integer",
                                entity_decls=[thread_idx]))
 
-        calls = self.reductions()
-
         # first check whether we have more than one reduction with the same
         # name in this Schedule. If so, raise an error as this is not
         # supported for a parallel region.
@@ -1403,18 +1428,16 @@ class OMPParallelDirective(OMPRegionDirective):
 
         zero_reduction_variables(calls, parent)
 
+        # Collect the clauses and join them just once
         # pylint: disable=protected-access
-        clauses_str = self.default_clause._clause_string
+        clauses = [self.default_clause._clause_string]
         # pylint: enable=protected-access
-
-        private_list = [child.symbol.name for child in private_clause.children]
         if private_list:
-            clauses_str += ", private(" + ",".join(private_list) + ")"
-        fp_list = [child.symbol.name for child in fprivate_clause.children]
+            clauses.append(f"private({','.join(private_list)})")
         if fp_list:
-            clauses_str += ", firstprivate(" + ",".join(fp_list) + ")"
+            clauses.append(f"firstprivate({','.join(fp_list)})")
         parent.add(DirectiveGen(parent, "omp", "begin", "parallel",
-                                f"{clauses_str}"))
+                                ", ".join(clauses)))
 
         if reprod_red_call_list:
             # add in a local thread index
@@ -1423,13 +1446,19 @@ class OMPParallelDirective(OMPRegionDirective):
             parent.add(AssignGen(parent, lhs=thread_idx,
                                  rhs="omp_get_thread_num()+1"))
 
-        first_type = type(self.dir_body[0])
-        for child in self.dir_body.children:
-            if first_type != type(child):
-                raise NotImplementedError("Cannot correctly generate code"
-                                          " for an OpenMP parallel region"
-                                          " containing children of "
-                                          "different types")
+        # Check that there is something to generate and that all children
+        # are of the same type before generating any of them.
+        children = self.dir_body.children
+        if not children:
+            raise GenerationError(
+                "Cannot generate code for an OpenMP parallel region with no "
+                "children")
+        if len(set(map(type, children))) > 1:
+            raise NotImplementedError("Cannot correctly generate code"
+                                      " for an OpenMP parallel region"
+                                      " containing children of "
+                                      "different types")
+        for child in children:
             child.gen_code(parent)
 
         parent.add(DirectiveGen(parent, "omp", "end", "parallel", ""))
@@ -1592,6 +1621,12 @@ class OMPParallelDirective(OMPRegionDirective):
         fprivate = set()
         need_sync = set()
 
+        # The symbols explicitly marked as private only depend on the first
+        # statement of the directive body, so look them up just once.
+        explicitly_private = set()
+        if self.dir_body.children and isinstance(self.dir_body[0], Loop):
+            explicitly_private = self.dir_body[0].explicitly_private_symbols
+
         # Determine variables that must be private, firstprivate or need_sync
         var_accesses = VariablesAccessInfo()
         self.reference_accesses(var_accesses)
@@ -1609,9 +1644,7 @@ class OMPParallelDirective(OMPRegionDirective):
 
             # If it is manually marked as a local symbol, add it to private or
             # firstprivate set
-            if (isinstance(symbol, DataSymbol) and
-                    isinstance(self.dir_body[0], Loop) and
-                    symbol in self.dir_body[0].explicitly_private_symbols):
+            if isinstance(symbol, DataSymbol) and symbol in explicitly_private:
                 if any(ref.symbol is symbol for ref in self.preceding()
                        if isinstance(ref, Reference)):
                     # If it's used before the loop, make it firstprivate
@@ -1723,15 +1756,19 @@ class OMPParallelDirective(OMPRegionDirective):
             OpenMP), it is likely that an absence of directives
             is an error on the part of the user. '''
         # We need to recurse down through all our children and check
-        # whether any of them are an OMPRegionDirective.
-        node_list = self.walk(OMPRegionDirective)
-        if not node_list:
-            # TODO raise a warning here so that the user can decide
-            # whether or not this is OK.
-            pass
-            # raise GenerationError("OpenMP parallel region does not enclose "
-            #                       "any OpenMP directives. This is probably "
-            #                       "not what you want.")
+        # whether any of them are an OMPRegionDirective. Stop as soon as
+        # one is found rather than collecting all of them.
+        to_visit = list(self.dir_body.children)
+        while to_visit:
+            node = to_visit.pop()
+            if isinstance(node, OMPRegionDirective):
+                return
+            to_visit.extend(node.children)
+        # TODO raise a warning here so that the user can decide
+        # whether or not this is OK.
+        # raise GenerationError("OpenMP parallel region does not enclose "
+        #                       "any OpenMP directives. This is probably "
+        #                       "not what you want.")
 
 
 class OMPTaskloopDirective(OMPRegionDirective):
@@ -1843,8 +1880,8 @@ class OMPTaskloopDirective(OMPRegionDirective):
 
         # Check children are well formed.
         # _validate_child will ensure position 0 and 1 are valid.
-        if len(self._children) == 3 and isinstance(self._children[1],
-                                                   OMPNogroupClause):
+        children = self._children
+        if len(children) == 3 and isinstance(children[1], OMPNogroupClause):
             raise GenerationError(
                 "OMPTaskloopDirective has two Nogroup clauses as children "
                 "which is not allowed.")
@@ -1955,12 +1992,16 @@ class OMPDoDirective(OMPRegionDirective):
         :returns: whether other is equal to self.
         :rtype: bool
         '''
-        is_eq = super().__eq__(other)
-        is_eq = is_eq and self.omp_schedule == other.omp_schedule
-        is_eq = is_eq and self.reprod == other.reprod
-        is_eq = is_eq and self.collapse == other.collapse
-
-        return is_eq
+        if self is other:
+            return True
+        # Compare the type and the clause values before the (potentially
+        # expensive) comparison of the whole subtrees.
+        if type(self) is not type(other):
+            return False
+        return (self.omp_schedule == other.omp_schedule and
+                self.reprod == other.reprod and
+                self.collapse == other.collapse and
+                super().__eq__(other))
 
     @property
     def collapse(self):
@@ -2023,13 +2064,14 @@ class OMPDoDirective(OMPRegionDirective):
         :returns: the OMP reduction information.
         :rtype: str
         '''
-        for reduction_type in AccessType.get_valid_reduction_modes():
-            reductions = self._get_reductions_list(reduction_type)
-            parts = []
-            for reduction in reductions:
-                parts.append(f"reduction("
-                             f"{OMP_OPERATOR_MAPPING[reduction_type]}:"
-                             f"{reduction})")
+        # A single walk is enough to find out whether there are any
+        # reductions at all, in which case there is no need to search
+        # for each of the reduction modes.
+        if not self.reductions():
+            return ""
+        parts = [f"reduction({operator}:{reduction})"
+                 for reduction_type, operator in _OMP_REDUCTION_MODES
+                 for reduction in self._get_reductions_list(reduction_type)]
         return ", ".join(parts)
 
     @property
@@ -2087,8 +2129,7 @@ class OMPDoDirective(OMPRegionDirective):
         # can apply transformations to the code). As a loop
         # directive, we must have an OMPParallelDirective as an ancestor
         # somewhere back up the tree.
-        if not self.ancestor(OMPParallelDirective,
-                             excluding=OMPParallelDoDirective):
+        if not self._nearest_omp_parallel():
             raise GenerationError(
                 "OMPDoDirective must be inside an OMP parallel region but "
                 "could not find an ancestor OMPParallelDirective node")
@@ -2128,17 +2169,18 @@ class OMPDoDirective(OMPRegionDirective):
         :raises GenerationError: if the child of this directive is not a Loop.
 
         '''
-        if len(self.dir_body.children) != 1:
+        children = self.dir_body.children
+        if len(children) != 1:
             raise GenerationError(
                 f"An {type(self).__name__} can only be applied to a single "
-                f"loop but this Node has {len(self.dir_body.children)} "
-                f"children: {self.dir_body.children}")
+                f"loop but this Node has {len(children)} "
+                f"children: {children}")
 
-        if not isinstance(self.dir_body[0], Loop):
+        if not isinstance(children[0], Loop):
             raise GenerationError(
                 f"An {type(self).__name__} can only be applied to a loop but "
                 f"this Node has a child of type "
-                f"'{type(self.dir_body[0]).__name__}'")
+                f"'{type(children[0]).__name__}'")
 
     def gen_code(self, parent):
         '''
@@ -2172,15 +2214,41 @@ class OMPDoDirective(OMPRegionDirective):
         # As we're a loop we don't specify the scope
         # of any variables so we don't have to generate the
         # list of private variables
-        options = ", ".join(parts)
-        parent.add(DirectiveGen(parent, "omp", "begin", "do", options))
+        self._gen_directive_and_loop(parent, ", ".join(parts))
 
-        for child in self.children:
-            child.gen_code(parent)
+    def _gen_directive_and_loop(self, parent, options):
+        '''
+        Add the f2pygen begin directive with the supplied clauses, the code
+        of the (single) loop that this directive applies to and the matching
+        end directive to the supplied parent. This is shared by the gen_code
+        of this class and of its subclasses.
+
+        :param parent: the parent Node in the Schedule to which to add our
+                       content.
+        :type parent: sub-class of :py:class:`psyclone.f2pygen.BaseGen`
+        :param str options: the clauses to add to the begin directive.
+
+        '''
+        parent.add(DirectiveGen(parent, "omp", "begin",
+                                self._directive_string, options))
+
+        # validate_global_constraints() has checked that the directive body
+        # is a single loop.
+        self.dir_body[0].gen_code(parent)
 
         # make sure the directive occurs straight after the loop body
         position = parent.previous_loop()
-        parent.add(DirectiveGen(parent, "omp", "end", "do", ""),
+
+        # DirectiveGen only accepts 3 terms, e.g. "omp end loop", so for longer
+        # directive e.g. "omp end teams distribute parallel do", we split them
+        # between arguments and content (which is an additional string appended
+        # at the end)
+        terms = self.end_string().split()
+        # If its < 3 the array slices still work as expected
+        arguments = terms[:3]
+        content = " ".join(terms[3:])
+
+        parent.add(DirectiveGen(parent, *arguments, content=content),
                    position=["after", position])
 
     def begin_string(self):
@@ -2300,11 +2368,11 @@ class OMPParallelDoDirective(OMPParallelDirective, OMPDoDirective):
         # pylint: disable=protected-access
         default_str = self.children[1]._clause_string
         # pylint: enable=protected-access
+        # Only the sorted names are needed here, so there is no need to
+        # create the clause nodes themselves.
         private, fprivate, need_sync = self.infer_sharing_attributes()
-        private_clause = OMPPrivateClause.create(
-                            sorted(private, key=lambda x: x.name))
-        fprivate_clause = OMPFirstprivateClause.create(
-                            sorted(fprivate, key=lambda x: x.name))
+        private_list = sorted(symbol.name for symbol in private)
+        fp_list = sorted(symbol.name for symbol in fprivate)
         if need_sync:
             raise GenerationError(
                 f"OMPParallelDoDirective.gen_code() does not support symbols "
@@ -2313,12 +2381,10 @@ class OMPParallelDoDirective(OMPParallelDirective, OMPDoDirective):
 
         private_str = ""
         fprivate_str = ""
-        private_list = [child.symbol.name for child in private_clause.children]
         if private_list:
-            private_str = "private(" + ",".join(private_list) + ")"
-        fp_list = [child.symbol.name for child in fprivate_clause.children]
+            private_str = f"private({','.join(private_list)})"
         if fp_list:
-            fprivate_str = "firstprivate(" + ",".join(fp_list) + ")"
+            fprivate_str = f"firstprivate({','.join(fp_list)})"
 
         # Set schedule clause
         if self._omp_schedule != "none":
@@ -2326,31 +2392,12 @@ class OMPParallelDoDirective(OMPParallelDirective, OMPDoDirective):
         else:
             schedule_str = ""
 
-        # Add directive to the f2pygen tree
-        parent.add(
-            DirectiveGen(
-                parent, "omp", "begin", self._directive_string, ", ".join(
-                    text for text in [default_str, private_str, fprivate_str,
-                                      schedule_str, self._reduction_string()]
-                    if text)))
-
-        for child in self.dir_body:
-            child.gen_code(parent)
-
-        # make sure the directive occurs straight after the loop body
-        position = parent.previous_loop()
-
-        # DirectiveGen only accepts 3 terms, e.g. "omp end loop", so for longer
-        # directive e.g. "omp end teams distribute parallel do", we split them
-        # between arguments and content (which is an additional string appended
-        # at the end)
-        terms = self.end_string().split()
-        # If its < 3 the array slices still work as expected
-        arguments = terms[:3]
-        content = " ".join(terms[3:])
-
-        parent.add(DirectiveGen(parent, *arguments, content=content),
-                   position=["after", position])
+        # Add the directive and the loop to the f2pygen tree
+        self._gen_directive_and_loop(
+            parent, ", ".join(
+                text for text in [default_str, private_str, fprivate_str,
+                                  schedule_str, self._reduction_string()]
+                if text))
 
         # If there are nested OMPRegions, the post region code should be after
         # the top-level one
@@ -2456,7 +2503,7 @@ class OMPTargetDirective(OMPRegionDirective):
         parent.add(DirectiveGen(parent, "omp", "begin", "target"))
 
         # Generate the code for all of this node's children
-        for child in self.dir_body:
+        for child in self.dir_body.children:
             child.gen_code(parent)
 
         # Generate the end code for this node
@@ -2478,6 +2525,8 @@ class OMPLoopDirective(OMPRegionDirective):
     :param kwargs: additional keyword arguments provided to the PSyIR node.
     :type kwargs: unwrapped dict.
     '''
+    # The directives, one of which must enclose an OMPLoopDirective.
+    _VALID_ANCESTORS = (OMPTargetDirective, OMPParallelDirective)
 
     def __init__(self, collapse=None, **kwargs):
         super().__init__(**kwargs)
@@ -2495,10 +2544,13 @@ class OMPLoopDirective(OMPRegionDirective):
         :returns: whether other is equal to self.
         :rtype: bool
         '''
-        is_eq = super().__eq__(other)
-        is_eq = is_eq and self.collapse == other.collapse
-
-        return is_eq
+        if self is other:
+            return True
+        # Compare the type and the collapse value before the (potentially
+        # expensive) comparison of the whole subtrees.
+        if type(self) is not type(other):
+            return False
+        return self.collapse == other.collapse and super().__eq__(other)
 
     @property
     def collapse(self):
@@ -2593,17 +2645,18 @@ class OMPLoopDirective(OMPRegionDirective):
                                  number of nested Loops.
 
         '''
-        if len(self.dir_body.children) != 1:
+        children = self.dir_body.children
+        if len(children) != 1:
             raise GenerationError(
                 f"OMPLoopDirective must have exactly one child in its "
-                f"associated schedule but found {self.dir_body.children}.")
+                f"associated schedule but found {children}.")
 
-        if not isinstance(self.dir_body.children[0], Loop):
+        if not isinstance(children[0], Loop):
             raise GenerationError(
                 f"OMPLoopDirective must have a Loop as child of its associated"
-                f" schedule but found '{self.dir_body.children[0]}'.")
+                f" schedule but found '{children[0]}'.")
 
-        if not self.ancestor((OMPTargetDirective, OMPParallelDirective)):
+        if not self.ancestor(self._VALID_ANCESTORS):
             # Also omp teams or omp threads regions but these are not supported
             # in the PSyIR
             raise GenerationError(
@@ -2613,7 +2666,7 @@ class OMPLoopDirective(OMPRegionDirective):
         # If there is a collapse clause, there must be as many immediately
         # nested loops as the collapse value
         if self._collapse:
-            cursor = self.dir_body.children[0]
+            cursor = children[0]
             for depth in range(self._collapse):
                 if not isinstance(cursor, Loop):
                     raise GenerationError(
@@ -52,6 +52,12 @@ from psyclone.psyir.transformations.region_trans import RegionTrans
 from psyclone.psyir.transformations.transformation_error import (
     TransformationError)
 
+# The regex we use to determine whether a character declaration is
+# of assumed size ('LEN=*' or '*(*)').
+# TODO #2612 - improve the fparser2 frontend support for character
+# declarations.
+_ASSUMED_SIZE_RE = re.compile(r"\(\s*len\s*=\s*\*\s*\)|\*\s*\(\s*\*\s*\)")
+
 
 class ACCKernelsTrans(RegionTrans):
     '''
@@ -76,6 +82,8 @@ class ACCKernelsTrans(RegionTrans):
     '''
     excluded_node_types = (CodeBlock, Return, PSyDataNode,
                            psyGen.HaloExchange, WhileLoop)
+    # The types of node that validate() needs to examine within the region.
+    _VALIDATE_NODE_TYPES = (Reference, Assignment, Call, Loop)
 
     def apply(self, node: Union[Node, List[Node]], options: dict = None):
         '''
@@ -111,9 +119,18 @@ class ACCKernelsTrans(RegionTrans):
             options = {}
         default_present = options.get("default_present", False)
 
+        # The nodes in node_list are consecutive siblings (checked by
+        # validate()) so remove them from the end of the region backwards.
+        # This avoids computing the position of every node and displacing
+        # the rest of the region each time.
+        children = [parent.children.pop(index) for index in
+                    reversed(range(start_index,
+                                   start_index + len(node_list)))]
+        children.reverse()
+
         # Create a directive containing the nodes in node_list and insert it.
         directive = ACCKernelsDirective(
-            parent=parent, children=[node.detach() for node in node_list],
+            parent=parent, children=children,
             default_present=default_present)
 
         parent.children.insert(start_index, directive)
@@ -167,12 +184,6 @@ class ACCKernelsTrans(RegionTrans):
                 "GOcean InvokeSchedules")
         super().validate(node_list, options)
 
-        # The regex we use to determine whether a character declaration is
-        # of assumed size ('LEN=*' or '*(*)').
-        # TODO #2612 - improve the fparser2 frontend support for character
-        # declarations.
-        assumed_size = re.compile(r"\(\s*len\s*=\s*\*\s*\)|\*\s*\(\s*\*\s*\)")
-
         # Construct a list of any symbols that correspond to assumed-size
         # character strings. These can only be routine arguments.
         char_syms = []
@@ -186,19 +197,37 @@ class ACCKernelsTrans(RegionTrans):
                 if isinstance(sym.datatype, UnsupportedFortranType):
                     type_txt = sym.datatype.type_text.lower()
                     if (type_txt.startswith("character") and
-                            assumed_size.search(type_txt)):
+                            _ASSUMED_SIZE_RE.search(type_txt)):
                         char_syms.append(sym)
 
+        loop_check = not options.get("disable_loop_check", False)
+        found_loop = False
         for node in node_list:
+            # Classify all of the nodes of interest with a single walk of
+            # the tree rather than walking it once for each type.
+            refs = []
+            assigns = []
+            calls = []
+            for child in node.walk(self._VALIDATE_NODE_TYPES):
+                if isinstance(child, Reference):
+                    refs.append(child)
+                elif isinstance(child, Assignment):
+                    assigns.append(child)
+                elif isinstance(child, Call):
+                    calls.append(child)
+                else:
+                    found_loop = True
+
             # Check that there are no assumed-size character variables as these
             # cause an Internal Compiler Error with (at least) NVHPC <= 24.5.
-            for ref in node.walk(Reference):
-                if ref.symbol in char_syms:
-                    stmt = ref.ancestor(Statement)
-                    raise TransformationError(
-                        f"Assumed-size character variables cannot be enclosed "
-                        f"in an OpenACC region but found "
-                        f"'{stmt.debug_string()}'")
+            if char_syms:
+                for ref in refs:
+                    if ref.symbol in char_syms:
+                        stmt = ref.ancestor(Statement)
+                        raise TransformationError(
+                            f"Assumed-size character variables cannot be "
+                            f"enclosed in an OpenACC region but found "
+                            f"'{stmt.debug_string()}'")
             # Check there are no character assignments in the region as these
             # cause various problems with (at least) NVHPC <= 24.5
             if not options.get("allow_string", False):
@@ -206,28 +235,24 @@ class ACCKernelsTrans(RegionTrans):
                     f"{self.name} does not permit assignments involving "
                     f"character variables by default (use the 'allow_string' "
                     f"option to include them)")
-                for assign in node.walk(Assignment):
+                for assign in assigns:
                     ArrayAssignment2LoopsTrans.validate_no_char(
                         assign, message, options)
 
             # Check that any called routines are supported on the device.
-            for icall in node.walk(Call):
+            for icall in calls:
                 if not icall.is_available_on_device():
                     raise TransformationError(
                         f"Cannot include '{icall.debug_string()}' in an "
                         f"OpenACC region because it is not available on GPU.")
 
+            if loop_check and not found_loop:
+                found_loop = any(assign.is_array_assignment
+                                 for assign in assigns)
+
         # Check that we have at least one loop or array range within
         # the proposed region unless this has been disabled.
-        if options and options.get("disable_loop_check", False):
-            return
-
-        for node in node_list:
-            if (any(assign for assign in node.walk(Assignment)
-                    if assign.is_array_assignment) or node.walk(Loop)):
-                break
-        else:
-            # Branch executed if loop does not exit with a break
+        if loop_check and not found_loop:
             raise TransformationError(
                 "A kernels transformation must enclose at least one loop or "
                 "array range but none were found.")
@@ -119,8 +119,12 @@ class ReplaceInductionVariablesTrans(Transformation):
         :type replacement: :py:class:`psyclone.psyir.nodes.Node`
 
         '''
+        # Equal References must refer to symbols with the same name, so
+        # compare the names first to avoid the more expensive full
+        # comparison (which also compares any children) for most nodes.
+        name = original.symbol.name
         for node in psyir.walk(Reference):
-            if node == original:
+            if node.symbol.name == name and node == original:
                 copy = replacement.copy()
                 node.replace_with(copy)
 
@@ -213,21 +217,20 @@ class ReplaceInductionVariablesTrans(Transformation):
         # Find assignments that are directly part of the loop (this
         # prevents issues with assignment inside if statements):
         all_accesses = VariablesAccessInfo(node.loop_body)
-        indx = 0
-        while indx < len(node.loop_body.children):
-            assignment = node.loop_body.children[indx]
+        # Iterate over a copy of the list of statements, since the induction
+        # assignments are removed from the loop body as they are replaced.
+        # This must be done in order, since replacing one induction variable
+        # can turn a later assignment into an induction statement.
+        for assignment in list(node.loop_body.children):
             # Only handle assignments, ignore if statements etc
             if not isinstance(assignment, Assignment):
-                indx += 1
                 continue
 
             # Assignment to arrays are ignored as well:
             if isinstance(assignment.lhs, ArrayReference):
-                indx += 1
                 continue
 
             if not self._is_induction_variable(assignment, all_accesses):
-                indx += 1
                 continue
 
             # This assignment is an induction variable and can be replaced:
@@ -258,10 +261,6 @@ class ReplaceInductionVariablesTrans(Transformation):
             # Recompute the accesses in the body, which was modified
             all_accesses = VariablesAccessInfo(node.loop_body)
 
-            # Since the assignment is removed now, we do not need to
-            # increment 'indx' here, which will now point to the next
-            # statement in the body.
-
     # ------------------------------------------------------------------------
     def validate(self, node, options=None):
         '''Perform various checks to ensure that it is valid to apply the
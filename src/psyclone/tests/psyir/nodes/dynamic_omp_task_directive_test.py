@@ -41,9 +41,10 @@ import pytest
 from psyclone.errors import GenerationError, InternalError
 from psyclone.parse.algorithm import parse
 from psyclone.psyGen import PSyFactory
-from psyclone.psyir.nodes import Assignment, BinaryOperation, \
-        DynamicOMPTaskDirective, Literal, Loop, Reference
-from psyclone.psyir.symbols import DataSymbol, INTEGER_TYPE
+from psyclone.psyir.nodes import ArrayReference, Assignment, \
+        BinaryOperation, DynamicOMPTaskDirective, Literal, Loop, Reference
+from psyclone.psyir.nodes.dynamic_omp_task_directive import _ReferenceList
+from psyclone.psyir.symbols import ArrayType, DataSymbol, INTEGER_TYPE
 from psyclone.tests.utilities import Compile
 from psyclone.transformations import OMPSingleTrans, \
     OMPParallelTrans
@@ -53,6 +54,33 @@ GOCEAN_BASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
                                 "gocean1p0")
 
 
+def test_reference_list():
+    ''' Test that membership tests on a _ReferenceList match those of a
+    plain list of References. '''
+    sym = DataSymbol("a", INTEGER_TYPE)
+    arr = DataSymbol("b", ArrayType(INTEGER_TYPE, [10]))
+    ref_list = _ReferenceList()
+    assert Reference(sym) not in ref_list
+    ref_list.append(Reference(sym))
+    ref_list.append(ArrayReference.create(arr, [Literal("1", INTEGER_TYPE)]))
+    assert len(ref_list) == 2
+    assert Reference(sym) in ref_list
+    # A different symbol with the same name is equal.
+    assert Reference(DataSymbol("a", INTEGER_TYPE)) in ref_list
+    # The same symbol but a different type of Reference is not.
+    assert Reference(arr) not in ref_list
+    assert ArrayReference.create(arr, [Literal("1", INTEGER_TYPE)]) in ref_list
+    assert (ArrayReference.create(arr, [Literal("2", INTEGER_TYPE)]) not in
+            ref_list)
+    # Iteration returns the entries in the order they were appended.
+    assert [ref.symbol.name for ref in ref_list] == ["a", "b"]
+    # Only appending is supported, so the index can not get out of step
+    # with the entries.
+    for method in ["extend", "insert", "remove", "pop", "__setitem__",
+                   "__iadd__"]:
+        assert not hasattr(ref_list, method)
+
+
 def test_omp_task_directive_basic_full_array_test(
         fortran_reader, fortran_writer, tmpdir
         ):
@@ -223,6 +223,18 @@ def test_ompparallel_gen_code_clauses(monkeypatch):
             "need synchronisation, but found: ['a']" in str(err.value))
 
 
+def test_omp_parallel_gen_code_empty_body():
+    ''' Check that OMPParallelDirective.gen_code raises the expected error
+    if the parallel region has no children. '''
+    subroutine = Routine.create("testsub")
+    parallel = OMPParallelDirective.create()
+    subroutine.addchild(parallel)
+    with pytest.raises(GenerationError) as err:
+        parallel.gen_code(ModuleGen("test"))
+    assert ("Cannot generate code for an OpenMP parallel region with no "
+            "children" in str(err.value))
+
+
 def test_omp_paralleldo_clauses_gen_code(monkeypatch):
     ''' Check that the OMP ParallelDo clauses are generated
     appropriately. '''
@@ -610,6 +622,8 @@ def test_ompdo_equality():
     ompdo1.children[0]._symbol_table = symboltable
     ompdo2.children[0]._symbol_table = symboltable
     assert ompdo1 == ompdo2
+    assert ompdo1 == ompdo1
+    assert ompdo1 != OMPLoopDirective()
 
     loop2.detach()
     ompdo2 = OMPDoDirective(children=[loop2], reprod=not ompdo1.reprod)
@@ -1117,6 +1131,20 @@ def test_omp_parallel_encloses_omp_directive():
     omp_parallel._encloses_omp_directive()
 
 
+def test_omp_nearest_omp_parallel():
+    '''Test the _nearest_omp_parallel method of OMPDirective, which must
+    skip any enclosing OMPParallelDoDirective.
+
+    '''
+    single = OMPSingleDirective()
+    assert single._nearest_omp_parallel() is None
+    pdo = OMPParallelDoDirective()
+    pdo.dir_body.addchild(single)
+    assert single._nearest_omp_parallel() is None
+    parallel = OMPParallelDirective.create(children=[pdo])
+    assert single._nearest_omp_parallel() is parallel
+
+
 def test_omp_parallel_validate_child():
     ''' Test the validate_child method of OMPParallelDirective'''
     assert OMPParallelDirective._validate_child(0, Schedule()) is True
@@ -1697,6 +1725,8 @@ def test_omploop_equality():
     omploop1.children[0]._symbol_table = symboltable
     omploop2.children[0]._symbol_table = symboltable
     assert omploop1 == omploop2
+    assert omploop1 == omploop1
+    assert omploop1 != OMPDoDirective()
 
     omploop1.collapse = 2
     assert omploop1 != omploop2